@@ -7,13 +7,79 @@ dcn_client.py — Thin client for the DCN HTTP API with resilient token handling
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 import json
+import random
+import socket
+import threading
+import time
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 from eth_account import Account
 from eth_account.messages import encode_defunct
 
+try:  # optional: incremental decoding of large /execute responses
+    import ijson
+except ImportError:  # pragma: no cover - falls back to buffered decoding
+    ijson = None
+
+Response = Union[requests.Response, httpx.Response]
+# Failures worth retrying / reporting, from whichever HTTP backend is active.
+_CONNECTION_ERRORS = (requests.ConnectionError, httpx.NetworkError, httpx.ConnectTimeout)
+_REQUEST_ERRORS = (requests.RequestException, httpx.HTTPError)
+# Gateway statuses returned before the request reached the app; safe to resend any POST.
+_UNPROCESSED_STATUSES = (502, 503, 504)
+_NEWLINES_TO_SPACES = {ord("\n"): " ", ord("\r"): " "}
+
+
+def _never_sent(exc: Exception) -> bool:
+    """True if the connection failed before the request went out, so the server cannot have acted on it."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, requests.ConnectTimeout)):
+        return True
+    if isinstance(exc, requests.ConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], "reason", None), (NewConnectionError, ConnectTimeoutError))
+    return False
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on pooled sockets (urllib3 already sets TCP_NODELAY)."""
+
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", self.SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _ChunkReader:
+    """Minimal file-like view over an iterator of body chunks (what ijson reads from)."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs text; that must not consume data.
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if size < 0:
+            size = len(self._buf)
+        out = bytes(self._buf[:size])
+        del self._buf[:size]
+        return out
+
 
 class DCNClient:
     REQUIRED_TRANSFORMATIONS: Dict[str, str] = {
@@ -22,60 +88,204 @@ class DCNClient:
         "mul": "return x * args[0];",
         "div": "return args[0] == 0 ? 0 : x / args[0];",
     }
+    # Attempts per POST for transient failures (connection errors / 5xx); 401 reauth is separate.
+    POST_ATTEMPTS: int = 3
+    # Recent login (message, signature) pairs kept per (address, nonce); racing reauths reuse them.
+    SIGNATURE_CACHE_SIZE: int = 4
 
-    def __init__(self, base_url: str, timeout: float = 10.0):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        pool_maxsize: int = 64,
+        use_http2: bool = True,
+    ):
         self.base_url: str = base_url
         self.timeout: float = float(timeout)
         self.session: requests.Session = requests.Session()
+        # Keep connections to the DCN host alive across bursts of calls. The adapter's default
+        # max_retries (Retry(0, read=False)) already leaves retrying to _post_with_retry.
+        adapter = _KeepAliveAdapter(pool_connections=32, pool_maxsize=int(pool_maxsize), pool_block=False)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "Accept": "application/json",
             "Content-Type": "application/json",
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
         })
+        # HTTP/2 multiplexes concurrent calls over one connection; needs the optional `h2` package.
+        self._client: Optional[httpx.Client] = None
+        if use_http2:
+            try:
+                self._client = httpx.Client(
+                    http2=True,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=int(pool_maxsize), max_keepalive_connections=32),
+                    headers={
+                        "Accept": "application/json",
+                        "Content-Type": "application/json",
+                        "Accept-Encoding": "gzip, deflate",
+                    },
+                    follow_redirects=True,
+                )
+            except ImportError:  # h2 not installed: stay on the requests session
+                pass
         self.access_token: Optional[str] = None
+        self._auth_lock = threading.Lock()
+        self._signatures: OrderedDict[Tuple[str, str], Tuple[str, str]] = OrderedDict()
+        # Names of transformations known to exist on the server (they are never deleted).
+        self._transformation_cache: Set[str] = set()
 
     # ---------- internals ----------
-    def _handle_response(self, r: requests.Response):
+    def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        stream: bool = False,
+    ) -> Response:
+        if self._client is None:
+            return self.session.request(
+                method, url, headers=headers, data=data, timeout=self.timeout, stream=stream
+            )
+        if stream:
+            request = self._client.build_request(method, url, headers=headers, content=data)
+            return self._client.send(request, stream=True)
+        return self._client.request(method, url, headers=headers, content=data)
+
+    @staticmethod
+    def _iter_body(r: Response) -> Iterator[bytes]:
+        if isinstance(r, httpx.Response):
+            return r.iter_bytes()
+        return r.iter_content(chunk_size=64 * 1024)
+
+    @staticmethod
+    def _raise_for_status(r: Response) -> None:
+        """raise_for_status that raises requests.HTTPError on both backends (callers check that type)."""
+        if isinstance(r, httpx.Response):
+            try:
+                r.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                raise requests.HTTPError(str(exc), response=r) from exc
+            return
+        r.raise_for_status()
+
+    def _handle_response(self, r: Response):
         try:
-            data = r.json()
+            data = orjson.loads(r.content)
         except Exception:
-            r.raise_for_status()
+            self._raise_for_status(r)
             return {"raw": r.text}
-        if not r.ok:
+        if r.status_code >= 400:
             raise requests.HTTPError(f"{r.status_code} {data}", response=r)
         return data
 
+    @staticmethod
+    def _body_preview(r: Response, limit: int) -> str:
+        """Single-line, truncated response body for error messages (error paths only)."""
+        preview = (r.text or "").strip().translate(_NEWLINES_TO_SPACES)
+        if len(preview) > limit:
+            preview = preview[:limit] + "..."
+        return preview
+
     def _authz_headers(self) -> Dict[str, str]:
         h: Dict[str, str] = {}
         if self.access_token:
             h["Authorization"] = f"Bearer {self.access_token}"
         return h
 
-    def _post_with_retry(self, path: str, payload: Dict[str, Any], *, acct: Account) -> requests.Response:
+    def _post_json(self, url: str, payload: Dict[str, Any], **kwargs) -> Response:
+        return self._request("POST", url, data=orjson.dumps(payload), **kwargs)
+
+    @staticmethod
+    def _backoff(attempt: int) -> None:
+        """Full-jitter exponential backoff so concurrent workers don't retry in lockstep."""
+        time.sleep(random.uniform(0, min(2 ** attempt * 0.1, 2.0)))
+
+    def _sign_login(self, acct: Account, nonce: str) -> Tuple[str, str]:
+        """Return (message, signature) for a login nonce, signing each (address, nonce) only once."""
+        key = (acct.address, nonce)
+        signed = self._signatures.get(key)
+        if signed is not None:
+            self._signatures.move_to_end(key)
+        else:
+            msg = f"Login nonce: {nonce}"
+            signed = (msg, acct.sign_message(encode_defunct(text=msg)).signature.hex())
+            self._signatures[key] = signed
+            if len(self._signatures) > self.SIGNATURE_CACHE_SIZE:
+                self._signatures.popitem(last=False)
+        return signed
+
+    def _do_auth(self, acct: Account, *, stale_token: Optional[str] = None) -> None:
+        """
+        Single-flight nonce + sign + /auth. Callers that find a token other than
+        `stale_token` once they hold the lock reuse it instead of logging in again.
+        """
+        with self._auth_lock:
+            if self.access_token and self.access_token != stale_token:
+                return
+            msg, sig = self._sign_login(acct, self.get_nonce(acct.address))
+            self.post_auth(acct.address, msg, sig)
+
+    def _post_with_retry(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        *,
+        acct: Account,
+        stream: bool = False,
+        retry_transient: bool = False,
+    ) -> Response:
+        """
+        POST with one reauth on 401 and jittered-backoff retries sharing POST_ATTEMPTS.
+        By default only failures the server cannot have acted on (connect errors, 502/503/504)
+        are resent, since /feature, /particle and /transformation create objects. Calls safe to
+        repeat (/execute, preflight probes) pass retry_transient=True to also retry any 5xx and
+        network errors raised mid-request.
+        """
         self.ensure_auth(acct)
         url = f"{self.base_url}{path}"
-        r = self.session.post(url, json=payload, headers=self._authz_headers(), timeout=self.timeout)
-        if r.status_code == 401:
-            self.try_refresh_or_reauth(acct)
-            r = self.session.post(url, json=payload, headers=self._authz_headers(), timeout=self.timeout)
-        return r
+        reauthed = False
+        attempt = 0
+        while True:
+            token = self.access_token
+            try:
+                r = self._post_json(url, payload, headers=self._authz_headers(), stream=stream)
+            except _CONNECTION_ERRORS as exc:
+                attempt += 1
+                if attempt >= self.POST_ATTEMPTS or not (retry_transient or _never_sent(exc)):
+                    raise
+                self._backoff(attempt)
+                continue
+            if r.status_code == 401 and not reauthed:
+                r.close()
+                self._do_auth(acct, stale_token=token)
+                reauthed = True
+                continue
+            transient = r.status_code >= 500 if retry_transient else r.status_code in _UNPROCESSED_STATUSES
+            if transient and attempt + 1 < self.POST_ATTEMPTS:
+                r.close()
+                attempt += 1
+                self._backoff(attempt)
+                continue
+            return r
 
     # ---------- public HTTP ----------
     def get_nonce(self, address: str) -> str:
         url = f"{self.base_url}/nonce/{address}"
-        r = self.session.get(url, timeout=self.timeout)
-        r.raise_for_status()
-        js = r.json()
+        r = self._request("GET", url)
+        self._raise_for_status(r)
+        js = orjson.loads(r.content)
         if "nonce" not in js:
             raise ValueError(f"Unexpected nonce response: {js}")
         return str(js["nonce"])
 
     def post_auth(self, address: str, message: str, signature: str) -> Dict:
         url = f"{self.base_url}/auth"
-        r = self.session.post(
-            url,
-            json={"address": address, "message": message, "signature": signature},
-            timeout=self.timeout,
-        )
+        r = self._post_json(url, {"address": address, "message": message, "signature": signature})
         data = self._handle_response(r)
         self.access_token = data.get("access_token")
         return data
@@ -85,19 +295,13 @@ class DCNClient:
         """Login if we don't yet have tokens."""
         if self.access_token:
             return
-        nonce = self.get_nonce(acct.address)
-        msg = f"Login nonce: {nonce}"
-        sig = acct.sign_message(encode_defunct(text=msg)).signature.hex()
-        self.post_auth(acct.address, msg, sig)
+        self._do_auth(acct)
         if not self.access_token:
             raise RuntimeError("Auth failed — missing tokens")
 
     def try_refresh_or_reauth(self, acct: Account):
         """Do a fresh /auth with the same account (server currently exposes no refresh route)."""
-        nonce = self.get_nonce(acct.address)
-        msg = f"Login nonce: {nonce}"
-        sig = acct.sign_message(encode_defunct(text=msg)).signature.hex()
-        self.post_auth(acct.address, msg, sig)
+        self._do_auth(acct, stale_token=self.access_token)
 
     # ---------- feature/particle/execute ----------
     def post_feature(self, payload: Dict[str, Any], *, acct: Account) -> Dict[str, Any]:
@@ -110,17 +314,17 @@ class DCNClient:
 
     def get_feature(self, name: str) -> Dict[str, Any]:
         url = f"{self.base_url}/feature/{name}"
-        r = self.session.get(url, headers=self._authz_headers(), timeout=self.timeout)
+        r = self._request("GET", url, headers=self._authz_headers())
         return self._handle_response(r)
 
     def get_particle(self, name: str) -> Dict[str, Any]:
         url = f"{self.base_url}/particle/{name}"
-        r = self.session.get(url, headers=self._authz_headers(), timeout=self.timeout)
+        r = self._request("GET", url, headers=self._authz_headers())
         return self._handle_response(r)
 
     def get_transformation(self, name: str) -> Dict[str, Any]:
         url = f"{self.base_url}/transformation/{name}"
-        r = self.session.get(url, headers=self._authz_headers(), timeout=self.timeout)
+        r = self._request("GET", url, headers=self._authz_headers())
         return self._handle_response(r)
 
     def post_transformation(self, payload: Dict[str, Any], *, acct: Account) -> Dict[str, Any]:
@@ -128,19 +332,45 @@ class DCNClient:
         return self._handle_response(r)
 
     def has_transformation(self, name: str) -> bool:
+        if name in self._transformation_cache:
+            return True
         url = f"{self.base_url}/transformation/{name}"
-        r = self.session.get(url, headers=self._authz_headers(), timeout=self.timeout)
+        r = self._request("GET", url, headers=self._authz_headers())
         if r.status_code == 404:
             return False
         if 200 <= r.status_code < 300:
+            self._transformation_cache.add(name)
             return True
-        body_preview = (r.text or "").strip().replace("\n", " ")
-        if len(body_preview) > 300:
-            body_preview = body_preview[:300] + "..."
         raise RuntimeError(
-            f"Failed to check transformation '{name}': status={r.status_code}, response={body_preview}"
+            f"Failed to check transformation '{name}': status={r.status_code}, "
+            f"response={self._body_preview(r, 300)}"
         )
 
+    def clear_transformation_cache(self) -> None:
+        self._transformation_cache.clear()
+
+    def _create_transformation(self, name: str, sol_src: str, *, acct: Account) -> None:
+        payload = {"name": name, "sol_src": sol_src}
+        try:
+            created = self.post_transformation(payload, acct=acct)
+        except Exception as exc:
+            # The POST may have failed because the transformation appeared meanwhile.
+            if self.has_transformation(name):
+                return
+            raise RuntimeError(
+                f"Failed to auto-create required transformation '{name}'. "
+                f"Payload: {json.dumps(payload, ensure_ascii=False)}. Error: {exc}"
+            ) from exc
+
+        # A parsed, error-free body confirms creation; only an empty/raw body needs a GET to verify.
+        confirmed = isinstance(created, dict) and bool(created) and not ({"raw", "error"} & created.keys())
+        if not confirmed and not self.has_transformation(name):
+            raise RuntimeError(
+                f"Transformation '{name}' still missing after creation attempt. "
+                f"Payload: {json.dumps(payload, ensure_ascii=False)}"
+            )
+        self._transformation_cache.add(name)
+
     def ensure_required_transformations(
         self,
         *,
@@ -149,30 +379,22 @@ class DCNClient:
         auto_create: bool = True,
     ) -> None:
         required = required or self.REQUIRED_TRANSFORMATIONS
-        missing: List[str] = []
-
-        for name, sol_src in required.items():
-            if self.has_transformation(name):
-                continue
+        if not required:
+            return
+        # Log in once up front so the workers below don't race the auth path.
+        self.ensure_auth(acct)
 
-            if not auto_create:
-                missing.append(name)
-                continue
+        names = list(required)
+        with ThreadPoolExecutor(max_workers=min(8, len(names))) as pool:
+            present = list(pool.map(self.has_transformation, names))
+            missing: List[str] = [name for name, ok in zip(names, present) if not ok]
 
-            payload = {"name": name, "sol_src": sol_src}
-            try:
-                self.post_transformation(payload, acct=acct)
-            except Exception as exc:
-                raise RuntimeError(
-                    f"Failed to auto-create required transformation '{name}'. "
-                    f"Payload: {json.dumps(payload, ensure_ascii=False)}. Error: {exc}"
-                ) from exc
-
-            if not self.has_transformation(name):
-                raise RuntimeError(
-                    f"Transformation '{name}' still missing after creation attempt. "
-                    f"Payload: {json.dumps(payload, ensure_ascii=False)}"
-                )
+            if missing and auto_create:
+                list(pool.map(
+                    lambda name: self._create_transformation(name, required[name], acct=acct),
+                    missing,
+                ))
+                missing = []
 
         if missing:
             raise RuntimeError(
@@ -188,16 +410,46 @@ class DCNClient:
         samples_count: int,
         running_instances: List[Dict[str, int]],
     ) -> List[Dict[str, Any]]:
+        return list(self.iter_execute_samples(acct, particle_name, samples_count, running_instances))
+
+    def iter_execute_samples(
+        self,
+        acct: Account,
+        particle_name: str,
+        samples_count: int,
+        running_instances: List[Dict[str, int]],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield /execute samples one at a time. With ijson installed the body is
+        decoded straight off the socket instead of being buffered and parsed whole.
+        """
         payload = {
             "particle_name": particle_name,
             "samples_count": int(samples_count),
             "running_instances": running_instances,
         }
-        r = self._post_with_retry("/execute", payload, acct=acct)
-        data = self._handle_response(r)
-        if isinstance(data, list):
-            return data
-        raise RuntimeError(f"Unexpected /execute response shape: {type(data).__name__}")
+        if ijson is None:
+            r = self._post_with_retry("/execute", payload, acct=acct, retry_transient=True)
+            data = self._handle_response(r)
+            if not isinstance(data, list):
+                raise RuntimeError(f"Unexpected /execute response shape: {type(data).__name__}")
+            yield from data
+            return
+
+        r = self._post_with_retry("/execute", payload, acct=acct, stream=True, retry_transient=True)
+        try:
+            if r.status_code >= 400:
+                if isinstance(r, httpx.Response):
+                    r.read()  # streamed httpx bodies must be read before .content is available
+                self._handle_response(r)
+                self._raise_for_status(r)
+            events = ijson.parse(_ChunkReader(self._iter_body(r)), use_float=True)
+            _, first_event, _ = next(events, ("", None, None))
+            if first_event != "start_array":
+                raise RuntimeError(f"Unexpected /execute response shape: {first_event or 'empty'}")
+            yield from ijson.items(events, "item")
+        finally:
+            r.close()
 
     # ---------- startup checks ----------
     def preflight_endpoints(
@@ -248,22 +500,34 @@ class DCNClient:
             ),
         ]
 
-        for _, path, invalid_payload, sample_payload in checks:
-            try:
-                r = self._post_with_retry(path, invalid_payload, acct=acct)
-            except requests.RequestException as exc:
-                raise RuntimeError(
-                    f"Preflight failed for {path}: {exc}. "
-                    f"Sample payload: {json.dumps(sample_payload, ensure_ascii=False)}"
-                ) from exc
-
-            if r.status_code in (200, 201, 204, 400):
-                continue
+        self.ensure_auth(acct)
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            list(pool.map(lambda check: self._preflight_check(*check[1:], acct=acct), checks))
 
-            body_preview = (r.text or "").strip().replace("\n", " ")
-            if len(body_preview) > 500:
-                body_preview = body_preview[:500] + "..."
-            raise RuntimeError(
-                f"Preflight failed for {path}: status={r.status_code}, response={body_preview}. "
-                f"Sample payload: {json.dumps(sample_payload, ensure_ascii=False)}"
-            )
+    def _preflight_check(
+        self,
+        path: str,
+        invalid_payload: Dict[str, Any],
+        sample_payload: Dict[str, Any],
+        *,
+        acct: Account,
+    ) -> None:
+        try:
+            r = self._post_with_retry(path, invalid_payload, acct=acct, retry_transient=True)
+        except _REQUEST_ERRORS as exc:
+            raise self._preflight_error(path, str(exc), sample_payload) from exc
+        self._check_preflight_status(path, r, sample_payload)
+
+    @staticmethod
+    def _preflight_error(path: str, reason: str, sample_payload: Dict[str, Any]) -> RuntimeError:
+        return RuntimeError(
+            f"Preflight failed for {path}: {reason}. "
+            f"Sample payload: {json.dumps(sample_payload, ensure_ascii=False)}"
+        )
+
+    def _check_preflight_status(self, path: str, r: Response, sample_payload: Dict[str, Any]) -> None:
+        if r.status_code in (200, 201, 204, 400):
+            return
+        raise self._preflight_error(
+            path, f"status={r.status_code}, response={self._body_preview(r, 500)}", sample_payload
+        )
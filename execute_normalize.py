@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from typing import Any, Dict, Iterable, List, Tuple
-import re
+import sys
 
 SCALAR_BY_DIM_ID: Dict[int, str] = {
     0: "time",
@@ -23,36 +23,32 @@ def build_running_instances(seeds: Dict[str, int], dims: List[dict]) -> List[Dic
       - index 0: root start point (time seed)
       - index 1..N: one item per feature dimension in declared order
     """
-    running_instances: List[Dict[str, int]] = [{
-        "start_point": int(seeds.get("time", 0)),
-        "transformation_shift": 0,
-    }]
-
-    for dim in dims:
-        feature_name = (dim.get("feature_name") or "").strip().lower()
-        running_instances.append({
-            "start_point": int(seeds.get(feature_name, 0)),
-            "transformation_shift": 0,
-        })
-
-    return running_instances
+    names = [(dim.get("feature_name") or "").strip().lower() for dim in dims]
+    return [
+        {"start_point": int(seeds.get("time", 0)), "transformation_shift": 0},
+        *({"start_point": int(seeds.get(name, 0)), "transformation_shift": 0} for name in names),
+    ]
 
 
 def _parse_dim_id_from_path(path: str) -> int | None:
     if not path:
         return None
-    match = re.search(r":(\d+)$", path.strip())
-    if not match:
-        return None
-    try:
-        return int(match.group(1))
-    except ValueError:
+    _, sep, tail = path.strip().rpartition(":")
+    if not sep or not tail.isdecimal():
         return None
+    return int(tail)
 
 
 def _coerce_int_list(values: Any) -> List[int]:
     if not isinstance(values, list):
         return []
+    # Server-typed fast path: the decoded list is already all ints, reuse it as-is.
+    if all(type(value) is int for value in values):
+        return values
+    try:
+        return [int(value) for value in values]
+    except Exception:
+        pass
     out: List[int] = []
     for value in values:
         try:
@@ -62,36 +58,41 @@ def _coerce_int_list(values: Any) -> List[int]:
     return out
 
 
-def normalize_execute_samples(samples_list: List[dict]) -> Tuple[Dict[str, List[int]], List[str]]:
+def normalize_execute_samples(samples_list: Iterable[dict]) -> Tuple[Dict[str, List[int]], List[str]]:
     """
     Normalize execute output into scalar streams.
 
     Supported sample shapes:
       - Current server: {"path": "/particle_name:2", "data": [...]}  (dim-id mapping)
       - Legacy fallback: {"feature_path": "/x/y/pitch", "data": [...]} (tail-name mapping)
+
+    `samples_list` is consumed once, so a streaming iterator works as well as a list.
+    Iteration stops as soon as all six scalars are bound: a later sample for the same
+    scalar overrides an earlier one only while the set is still incomplete, and paths
+    after that point are neither read nor reported as unknown.
     """
     streams: Dict[str, List[int]] = {}
     unknown_paths: List[str] = []
 
     for sample in samples_list:
         path = str(sample.get("path") or sample.get("feature_path") or "").strip()
-        data = _coerce_int_list(sample.get("data", []))
-
-        if path:
-            dim_id = _parse_dim_id_from_path(path)
-            if dim_id is not None and dim_id in SCALAR_BY_DIM_ID:
-                streams[SCALAR_BY_DIM_ID[dim_id]] = data
-                continue
+        if not path:
+            unknown_paths.append("<missing path>")
+            continue
 
-            tail = path.split("/")[-1].strip().lower()
-            if tail in REQUIRED_SCALARS:
-                streams[tail] = data
+        scalar = SCALAR_BY_DIM_ID.get(_parse_dim_id_from_path(path))
+        if scalar is None:
+            tail = path.rsplit("/", 1)[-1].strip().lower()
+            if tail not in REQUIRED_SCALARS:
+                unknown_paths.append(path)
                 continue
+            # Literals above are already interned; map the parsed tail onto that same object.
+            scalar = sys.intern(tail)
 
-            unknown_paths.append(path)
-            continue
-
-        unknown_paths.append("<missing path>")
+        streams[scalar] = _coerce_int_list(sample.get("data", []))
+        # Anything after the full scalar set is auxiliary output we never read.
+        if len(streams) == len(REQUIRED_SCALARS):
+            break
 
     return streams, unknown_paths
 
@@ -4,8 +4,8 @@ Requires a user-defined instrument setup JSON (instruments.json by default,
 override with INSTRUMENT_CONFIG env var).
 """
 
-from typing import Tuple, Dict, List, Any
-import json, os, pathlib
+from typing import Tuple, Dict, List, Any, NamedTuple
+import json, os, pathlib, threading
 
 # Base URL of your DCN API.
 API_BASE: str = "https://api.decentralised.art"
@@ -16,18 +16,26 @@ def _load_instrument_config_from_file(path: pathlib.Path) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def _normalize_instr_block(raw: Dict[str, Any]) -> Dict[str, Dict[str, tuple]]:
-    out: Dict[str, Dict[str, tuple]] = {}
+class Instr(NamedTuple):
+    """Normalized instrument: hard MIDI range, tessitura, and polyphony flag."""
+    rng_lo: int
+    rng_hi: int
+    tess_lo: int
+    tess_hi: int
+    poly: bool
+
+def _normalize_instr_block(raw: Dict[str, Any]) -> Dict[str, Instr]:
+    out: Dict[str, Instr] = {}
     for name, meta in raw.items():
         rng = tuple(meta.get("range", (0, 0)))
         tess = tuple(meta.get("tess", meta.get("tessitura", rng)))
         poly = bool(meta.get("polyphonic", False))
         if len(rng) != 2:
             raise ValueError(f"Instrument {name} must have range [lo, hi]")
-        out[name] = {"range": (int(rng[0]), int(rng[1])), "tess": (int(tess[0]), int(tess[1])), "polyphonic": poly}
+        out[name] = Instr(int(rng[0]), int(rng[1]), int(tess[0]), int(tess[1]), poly)
     return out
 
-def _normalize_meta_block(raw: Dict[str, Any], instruments: Dict[str, Dict[str, tuple]]) -> Dict[str, Dict[str, Any]]:
+def _normalize_meta_block(raw: Dict[str, Any], instruments: Dict[str, Instr]) -> Dict[str, Dict[str, Any]]:
     out: Dict[str, Dict[str, Any]] = {}
     for name in instruments.keys():
         base = raw.get(name, {}) if isinstance(raw, dict) else {}
@@ -40,7 +48,7 @@ def _normalize_meta_block(raw: Dict[str, Any], instruments: Dict[str, Dict[str,
         }
     return out
 
-def load_instrument_setup(config_path: str | pathlib.Path | None = None) -> tuple[list[str], Dict[str, Dict[str, tuple]], Dict[str, Dict[str, Any]]]:
+def load_instrument_setup(config_path: str | pathlib.Path | None = None) -> tuple[list[str], Dict[str, Instr], Dict[str, Dict[str, Any]]]:
     """
     Load instrument order + ranges + meta from a JSON config.
     Shape of instruments.json:
@@ -93,8 +101,23 @@ def load_instrument_setup(config_path: str | pathlib.Path | None = None) -> tupl
     return order, instruments, meta
 
 
-# Expose loaded setup as module-level values for convenience
-ORDERED_INSTRS, INSTRUMENTS, INSTRUMENT_META = load_instrument_setup()
+# Loaded setup is exposed as module-level ORDERED_INSTRS / INSTRUMENTS / INSTRUMENT_META,
+# but only read from disk on first access (PEP 562), not at import time.
+_LAZY_SETUP = ("ORDERED_INSTRS", "INSTRUMENTS", "INSTRUMENT_META")
+_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
+def _ensure_loaded() -> Dict[str, Any]:
+    if not _cache:
+        with _cache_lock:
+            if not _cache:
+                _cache.update(zip(_LAZY_SETUP, load_instrument_setup()))
+    return _cache
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SETUP:
+        return _ensure_loaded()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Optional: ticks per bar per bar-index (expand as you add bars).
 # 1 tick = 1/16 note; 12 means 3/4 with 16th grid.
@@ -104,26 +127,37 @@ BAR_TICKS_BY_BAR = {
     3: 16,   # 4/4  (example)
 }
 
+# Extend this map if you use other metres on a 16th grid.
+_METER_MAP: Dict[int, Tuple[int, int]] = {12:(3,4), 8:(2,4), 16:(4,4), 4:(1,4)}
+
 def meter_from_ticks(ticks: int) -> Tuple[int, int]:
-    """
-    Map ticks to (numerator, denominator).
-    Extend this dict if you use other metres on a 16th grid.
-    """
-    return {12:(3,4), 8:(2,4), 16:(4,4), 4:(1,4)}.get(int(ticks), (4,4))
+    """Map ticks to (numerator, denominator)."""
+    return _METER_MAP.get(int(ticks), (4,4))
 
 
 def instruments_summary_lines(order: List[str] | None = None,
-                              instruments: Dict[str, Dict[str, tuple]] | None = None) -> List[str]:
+                              instruments: Dict[str, Instr] | None = None) -> List[str]:
     """Helper to render a readable instrument block for prompts/logs."""
-    order = order or ORDERED_INSTRS
-    instruments = instruments or INSTRUMENTS
+    order = order or _ensure_loaded()["ORDERED_INSTRS"]
+    instruments = instruments or _ensure_loaded()["INSTRUMENTS"]
     lines = []
     for name in order:
-        meta = instruments.get(name, {})
-        rng = meta.get("range", ("?", "?"))
-        poly = "polyphonic" if meta.get("polyphonic") else "monophonic"
-        lines.append(f"- {name}: [{rng[0]}..{rng[1]}] ({poly})")
+        instr = instruments.get(name)
+        if instr is None:
+            lines.append(f"- {name}: [?..?] (monophonic)")
+            continue
+        poly = "polyphonic" if instr.poly else "monophonic"
+        lines.append(f"- {name}: [{instr.rng_lo}..{instr.rng_hi}] ({poly})")
     return lines
 
 def is_polyphonic(instrument: str) -> bool:
-    return bool(INSTRUMENTS.get(instrument, {}).get("polyphonic", False))
+    instr = _ensure_loaded()["INSTRUMENTS"].get(instrument)
+    return instr is not None and instr.poly
+
+def clamp_pitches(instrument: str, pitches: List[int]) -> List[int]:
+    """Clamp a pitch stream into the instrument's hard range (unknown instruments pass through)."""
+    instr = _ensure_loaded()["INSTRUMENTS"].get(instrument)
+    if instr is None:
+        return list(pitches)
+    lo, hi = instr.rng_lo, instr.rng_hi
+    return [lo if p < lo else hi if p > hi else p for p in pitches]
@@ -10,6 +10,7 @@ as an extra system message so the model composes with awareness of what came bef
 
 import os, json, time, pathlib, importlib.util, statistics
 from typing import Dict, List, Any, Optional
+from contextlib import closing
 from datetime import datetime
 from eth_account import Account
 from openai import OpenAI, APITimeoutError
@@ -636,8 +637,9 @@ def generate_unit_from_template(
             running_instances = build_running_instances(seeds, dims)
 
             print(f"[{label}] {bar_label}: EXEC particle={particle_name} root_feature={fname} N={N}")
-            samples = dcn.execute_particle(acct, particle_name, N, running_instances)
-            streams, unknown_paths = normalize_execute_samples(samples)
+            # closing(): normalize may stop early; release the streamed response right away.
+            with closing(dcn.iter_execute_samples(acct, particle_name, N, running_instances)) as samples:
+                streams, unknown_paths = normalize_execute_samples(samples)
             require_scalar_streams(
                 streams,
                 label=f"{label} {bar_label} {particle_name}",
@@ -8,12 +8,17 @@ Prompt loading/rendering utilities (TXT-friendly):
   (the latter is a back-compat alias).
 """
 
+from __future__ import annotations
+
 from string import Template
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 import json
 import pathlib
 import re
 
+if TYPE_CHECKING:
+    from pt_config import Instr
+
 # Anchors to file locations relative to this file's folder.
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 PROMPTS_DIR = BASE_DIR / "prompts"
@@ -33,9 +38,9 @@ def load_system_prompt(fallback: str = "") -> str:
     return _read_text(p) if p.exists() else fallback
 
 
-def _instruments_payload(instruments: Dict[str, Dict[str, tuple]]) -> List[Dict]:
+def _instruments_payload(instruments: Dict[str, Instr]) -> List[Dict]:
     return [
-        {"id": k, "range": list(v["range"]), "tessitura": list(v["tess"])}
+        {"id": k, "range": [v.rng_lo, v.rng_hi], "tessitura": [v.tess_lo, v.tess_hi]}
         for k, v in instruments.items()
     ]
 
@@ -45,7 +50,7 @@ def _render_text_core(
     bar_ticks: int,
     num: int,
     den: int,
-    instruments: Dict[str, Dict[str, tuple]],
+    instruments: Dict[str, Instr],
 ) -> str:
     """
     Render ANY prompts/user/* file. If it contains $-placeholders, we substitute:
@@ -67,9 +72,8 @@ def _render_text_core(
     # Append explicit numeric ranges so the model can't miss them
     lines = []
     lines.append("\nHARD RANGES (MIDI NUMBERS — MUST STAY INSIDE)")
-    for name, meta in instruments.items():
-        lo, hi = meta["range"]
-        lines.append(f"- {name}: [{lo}..{hi}]")
+    for name, instr in instruments.items():
+        lines.append(f"- {name}: [{instr.rng_lo}..{instr.rng_hi}]")
     lines.append("- Use ONLY these instruments. Emit exactly one PT/run_plan pair per instrument above; no extras.")
 
     # Also re-assert meter/ticks so the JSON uses correct seeds
@@ -91,7 +95,7 @@ def render_user_prompt_file(
     bar_ticks: int,
     num: int,
     den: int,
-    instruments: Dict[str, Dict[str, tuple]],
+    instruments: Dict[str, Instr],
 ) -> str:
     """Primary entry point used by pt_generate.py."""
     return _render_text_core(
@@ -110,7 +114,7 @@ def render_user_prompt_from_file(
     bar_ticks: int,
     num: int,
     den: int,
-    instruments: Dict[str, Dict[str, tuple]],
+    instruments: Dict[str, Instr],
     extra_vars=None,  # ignored in TXT mode
 ) -> str:
     return _render_text_core(
@@ -0,0 +1,344 @@
+import importlib.util
+import io
+import threading
+import time
+import unittest
+from unittest import mock
+
+import httpx
+import requests
+from eth_account import Account
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from dcn_client import DCNClient, _never_sent
+
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+
+SAMPLES_BODY = (
+    b'[{"path": "/my_particle:0", "data": [0, 1, 2]},'
+    b' {"path": "/my_particle:2", "data": [60, 62, 64]}]'
+)
+EXPECTED_SAMPLES = [
+    {"path": "/my_particle:0", "data": [0, 1, 2]},
+    {"path": "/my_particle:2", "data": [60, 62, 64]},
+]
+
+
+def _chunked(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def _requests_response(status: int, body: bytes) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.raw = io.BytesIO(body)
+    return r
+
+
+class SessionTests(unittest.TestCase):
+    def test_read_timeouts_stay_read_timeouts(self):
+        client = DCNClient("http://dcn.test", use_http2=False)
+        retries = client.session.get_adapter("http://dcn.test").max_retries
+        self.assertEqual(retries.total, 0)
+        self.assertIs(retries.read, False)
+
+    @unittest.skipUnless(HAS_H2, "h2 not installed")
+    def test_http2_client_used_when_h2_available(self):
+        self.assertIsNotNone(DCNClient("http://dcn.test", use_http2=True)._client)
+
+    def test_falls_back_to_requests_session_without_h2(self):
+        with mock.patch("dcn_client.httpx.Client", side_effect=ImportError("h2")):
+            client = DCNClient("http://dcn.test", use_http2=True)
+        self.assertIsNone(client._client)
+
+
+class IterExecuteSamplesTests(unittest.TestCase):
+    def _iter_with(self, response):
+        client = DCNClient("http://dcn.test", use_http2=False)
+        with mock.patch.object(client, "_post_with_retry", return_value=response):
+            return list(client.iter_execute_samples(None, "my_particle", 3, []))
+
+    def test_streams_multi_chunk_httpx_body(self):
+        response = httpx.Response(200, content=iter(_chunked(SAMPLES_BODY, 7)))
+        self.assertEqual(self._iter_with(response), EXPECTED_SAMPLES)
+
+    def test_streams_single_chunk_httpx_body(self):
+        response = httpx.Response(200, content=iter([SAMPLES_BODY]))
+        self.assertEqual(self._iter_with(response), EXPECTED_SAMPLES)
+
+    def test_streams_requests_body(self):
+        self.assertEqual(self._iter_with(_requests_response(200, SAMPLES_BODY)), EXPECTED_SAMPLES)
+
+    def test_close_releases_response_early(self):
+        client = DCNClient("http://dcn.test", use_http2=False)
+        response = httpx.Response(200, content=iter(_chunked(SAMPLES_BODY, 7)))
+        with mock.patch.object(client, "_post_with_retry", return_value=response):
+            samples = client.iter_execute_samples(None, "my_particle", 3, [])
+            self.assertEqual(next(samples), EXPECTED_SAMPLES[0])
+            samples.close()
+        self.assertTrue(response.is_closed)
+
+    def test_rejects_non_list_body(self):
+        response = httpx.Response(200, content=iter([b'{"error": "nope"}']))
+        with self.assertRaises(RuntimeError):
+            self._iter_with(response)
+
+
+class HandleResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.client = DCNClient("http://dcn.test", use_http2=False)
+        self.request = httpx.Request("POST", "http://dcn.test/feature")
+
+    def test_httpx_non_json_error_raises_requests_http_error(self):
+        response = httpx.Response(502, text="<html>bad gateway</html>", request=self.request)
+        with self.assertRaises(requests.HTTPError) as ctx:
+            self.client._handle_response(response)
+        self.assertEqual(ctx.exception.response.text, "<html>bad gateway</html>")
+
+    def test_httpx_json_error_raises_requests_http_error(self):
+        response = httpx.Response(400, json={"error": "bad dims"}, request=self.request)
+        with self.assertRaises(requests.HTTPError) as ctx:
+            self.client._handle_response(response)
+        self.assertIn("bad dims", ctx.exception.response.text)
+
+    def test_requests_non_json_error_raises_requests_http_error(self):
+        with self.assertRaises(requests.HTTPError):
+            self.client._handle_response(_requests_response(500, b"oops"))
+
+
+class PreflightTests(unittest.TestCase):
+    def setUp(self):
+        self.client = DCNClient("http://dcn.test", use_http2=False)
+        self.client.access_token = "token"
+
+    def _run_preflight(self, handler):
+        self.client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        self.client.preflight_endpoints(acct=None, ensure_transformations=False)
+
+    def test_all_400_passes(self):
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            return httpx.Response(400)
+
+        self._run_preflight(handler)
+        self.assertEqual(sorted(paths), ["/execute", "/feature", "/particle"])
+
+    def test_non_transient_failure_raises(self):
+        with self.assertRaises(RuntimeError) as ctx:
+            self._run_preflight(lambda request: httpx.Response(404, text="missing"))
+        self.assertIn("status=404", str(ctx.exception))
+
+
+class PostWithRetryTests(unittest.TestCase):
+    def setUp(self):
+        self.acct = Account.create()
+        self.client = DCNClient("http://dcn.test", use_http2=False)
+        self.client.access_token = "old"
+        self.calls = {}
+        self.calls_lock = threading.Lock()
+        patcher = mock.patch.object(DCNClient, "_backoff")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _serve(self, feature_handler, auth_delay: float = 0.0):
+        def handler(request):
+            path = request.url.path
+            with self.calls_lock:
+                self.calls[path] = self.calls.get(path, 0) + 1
+            if path.startswith("/nonce/"):
+                return httpx.Response(200, json={"nonce": "42"})
+            if path == "/auth":
+                time.sleep(auth_delay)
+                return httpx.Response(200, json={"access_token": "fresh"})
+            return feature_handler(request)
+
+        self.client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def _post(self, path="/feature", **kwargs):
+        return self.client._post_with_retry(path, {"name": "f"}, acct=self.acct, **kwargs)
+
+    def test_503_then_200_is_retried(self):
+        statuses = iter([503, 200])
+        self._serve(lambda request: httpx.Response(next(statuses)))
+        self.assertEqual(self._post().status_code, 200)
+        self.assertEqual(self.calls["/feature"], 2)
+
+    def test_500_on_creating_post_is_not_resent(self):
+        self._serve(lambda request: httpx.Response(500))
+        self.assertEqual(self._post().status_code, 500)
+        self.assertEqual(self.calls["/feature"], 1)
+
+    def test_500_is_retried_when_transient_retries_allowed(self):
+        self._serve(lambda request: httpx.Response(500))
+        self.assertEqual(self._post("/execute", retry_transient=True).status_code, 500)
+        self.assertEqual(self.calls["/execute"], DCNClient.POST_ATTEMPTS)
+
+    def test_connect_error_retried_until_budget_then_raised(self):
+        def refuse(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        self._serve(refuse)
+        with self.assertRaises(httpx.ConnectError):
+            self._post()
+        self.assertEqual(self.calls["/feature"], DCNClient.POST_ATTEMPTS)
+
+    def test_read_error_on_creating_post_is_not_resent(self):
+        def drop(request):
+            raise httpx.ReadError("reset", request=request)
+
+        self._serve(drop)
+        with self.assertRaises(httpx.ReadError):
+            self._post()
+        self.assertEqual(self.calls["/feature"], 1)
+
+    def test_401_reauths_and_retries_once(self):
+        self._serve(lambda request: httpx.Response(
+            200 if request.headers["Authorization"] == "Bearer fresh" else 401
+        ))
+        self.assertEqual(self._post().status_code, 200)
+        self.assertEqual(self.calls["/feature"], 2)
+        self.assertEqual(self.calls["/auth"], 1)
+        self.assertEqual(self.client.access_token, "fresh")
+
+    def test_second_401_is_returned_as_is(self):
+        self._serve(lambda request: httpx.Response(401))
+        self.assertEqual(self._post().status_code, 401)
+        self.assertEqual(self.calls["/feature"], 2)
+        self.assertEqual(self.calls["/auth"], 1)
+
+    def test_concurrent_401s_share_one_auth(self):
+        self._serve(
+            lambda request: httpx.Response(200 if request.headers["Authorization"] == "Bearer fresh" else 401),
+            auth_delay=0.05,
+        )
+        start = threading.Barrier(4)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(self._post().status_code)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [200] * 4)
+        self.assertEqual(self.calls["/auth"], 1)
+
+    def test_requests_errors_classified_by_whether_request_was_sent(self):
+        refused = MaxRetryError(None, "/feature", NewConnectionError(None, "refused"))
+        aborted = ProtocolError("Connection aborted.", ConnectionResetError())
+        self.assertTrue(_never_sent(requests.ConnectionError(refused)))
+        self.assertTrue(_never_sent(requests.ConnectTimeout()))
+        self.assertFalse(_never_sent(requests.ConnectionError(aborted)))
+
+
+class TransformationTests(unittest.TestCase):
+    def setUp(self):
+        self.client = DCNClient("http://dcn.test", use_http2=False)
+        self.client.access_token = "token"
+        self.requests = []
+
+    def _serve(self, *, get_status=404, post_response=None):
+        def handler(request):
+            self.requests.append((request.method, request.url.path))
+            if request.method == "GET":
+                return httpx.Response(get_status, json={})
+            return post_response or httpx.Response(200, json={"name": "add"})
+
+        self.client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def test_cache_hit_skips_get(self):
+        self._serve(get_status=200)
+        self.assertTrue(self.client.has_transformation("add"))
+        self.assertTrue(self.client.has_transformation("add"))
+        self.assertEqual(self.requests, [("GET", "/transformation/add")])
+
+    def test_missing_transformation_is_not_cached(self):
+        self._serve(get_status=404)
+        self.assertFalse(self.client.has_transformation("add"))
+        self.assertFalse(self.client.has_transformation("add"))
+        self.assertEqual(len(self.requests), 2)
+
+    def test_clear_transformation_cache_forces_get(self):
+        self._serve(get_status=200)
+        self.client.has_transformation("add")
+        self.client.clear_transformation_cache()
+        self.client.has_transformation("add")
+        self.assertEqual(len(self.requests), 2)
+
+    def test_failed_post_counts_as_created_when_get_finds_it(self):
+        gets = iter([404, 200])
+
+        def handler(request):
+            self.requests.append((request.method, request.url.path))
+            if request.method == "GET":
+                return httpx.Response(next(gets), json={})
+            return httpx.Response(409, json={"error": "exists"})
+
+        self.client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        self.client.ensure_required_transformations(acct=None, required={"add": "return x + args[0];"})
+        self.assertIn("add", self.client._transformation_cache)
+
+    def _create(self, post_response, *, get_status):
+        self._serve(get_status=get_status, post_response=post_response)
+        self.client._create_transformation("add", "return x + args[0];", acct=None)
+
+    def test_named_post_body_skips_verify_get(self):
+        self._create(httpx.Response(200, json={"name": "add"}), get_status=404)
+        self.assertEqual(self.requests, [("POST", "/transformation")])
+        self.assertIn("add", self.client._transformation_cache)
+
+    def test_raw_post_body_triggers_verify_get(self):
+        self._create(httpx.Response(200, text="ok"), get_status=200)
+        self.assertEqual(self.requests, [("POST", "/transformation"), ("GET", "/transformation/add")])
+
+    def test_error_post_body_triggers_verify_get(self):
+        with self.assertRaises(RuntimeError) as ctx:
+            self._create(httpx.Response(200, json={"error": "compile failed"}), get_status=404)
+        self.assertIn("still missing", str(ctx.exception))
+        self.assertEqual(self.requests, [("POST", "/transformation"), ("GET", "/transformation/add")])
+
+    def test_auto_create_off_reports_every_missing_name(self):
+        self._serve(get_status=404)
+        with self.assertRaises(RuntimeError) as ctx:
+            self.client.ensure_required_transformations(acct=None, auto_create=False)
+        for name in DCNClient.REQUIRED_TRANSFORMATIONS:
+            self.assertIn(name, str(ctx.exception))
+        self.assertNotIn("POST", [method for method, _ in self.requests])
+
+    def test_auto_create_posts_only_missing_names(self):
+        def handler(request):
+            self.requests.append((request.method, request.url.path))
+            if request.method == "GET":
+                return httpx.Response(200 if request.url.path.endswith(("/add", "/mul")) else 404, json={})
+            return httpx.Response(200, json={"name": "created"})
+
+        self.client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        self.client.ensure_required_transformations(acct=None)
+        self.assertEqual(sorted(p for m, p in self.requests if m == "POST"), ["/transformation"] * 2)
+        self.assertEqual(self.client._transformation_cache, set(DCNClient.REQUIRED_TRANSFORMATIONS))
+
+
+class SignLoginTests(unittest.TestCase):
+    def test_recently_used_signature_survives_eviction(self):
+        client = DCNClient("http://dcn.test", use_http2=False)
+        acct = Account.create()
+        for nonce in ("n0", "n1", "n2", "n3"):
+            client._sign_login(acct, nonce)
+
+        msg, _ = client._sign_login(acct, "n0")  # hit: becomes most recent
+        client._sign_login(acct, "n4")  # evicts the least recently used entry, n1
+
+        self.assertEqual(msg, "Login nonce: n0")
+        cached = [nonce for _, nonce in client._signatures]
+        self.assertEqual(cached, ["n2", "n3", "n0", "n4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,6 +44,51 @@ class NormalizeExecuteSamplesTests(unittest.TestCase):
         self.assertEqual(streams["denominator"], [4, 4, 4])
         self.assertEqual(unknown, [])
 
+    def test_normalize_reports_unparseable_dim_ids(self):
+        samples = [
+            {"path": "/my_particle:2", "data": [60]},
+            {"path": "/my_particle:x", "data": [1]},
+            {"path": "/my_particle:", "data": [1]},
+            {"path": "/my_particle:9", "data": [1]},
+        ]
+
+        streams, unknown = normalize_execute_samples(samples)
+
+        self.assertEqual(streams, {"pitch": [60]})
+        self.assertEqual(unknown, ["/my_particle:x", "/my_particle:", "/my_particle:9"])
+
+    def test_normalize_coerces_mixed_data(self):
+        samples = [
+            {"path": "/my_particle:0", "data": [0, "1", 2.0]},
+            {"path": "/my_particle:1", "data": [1, "bad", None, 3]},
+        ]
+
+        streams, _ = normalize_execute_samples(samples)
+
+        self.assertEqual(streams["time"], [0, 1, 2])
+        self.assertEqual(streams["duration"], [1, 3])
+
+    def test_normalize_stops_once_all_scalars_bound(self):
+        samples = [{"path": f"/my_particle:{dim_id}", "data": [dim_id]} for dim_id in range(6)]
+        samples.append({"path": "/my_particle:aux", "data": [1]})
+
+        streams, unknown = normalize_execute_samples(iter(samples))
+
+        self.assertEqual(len(streams), 6)
+        self.assertEqual(unknown, [])
+
+    def test_normalize_duplicate_overrides_only_until_complete(self):
+        samples = [
+            {"path": "/my_particle:0", "data": [0]},
+            {"path": "/my_particle:0", "data": [5]},
+        ]
+        samples += [{"path": f"/my_particle:{dim_id}", "data": [dim_id]} for dim_id in range(1, 6)]
+        samples.append({"path": "/my_particle:0", "data": [9]})
+
+        streams, _ = normalize_execute_samples(samples)
+
+        self.assertEqual(streams["time"], [5])
+
     def test_require_scalar_streams_raises_on_missing(self):
         with self.assertRaises(RuntimeError) as ctx:
             require_scalar_streams({"time": [0]}, label="unitA bar01", unknown_paths=["/bad/path"])
@@ -0,0 +1,33 @@
+import unittest
+from unittest import mock
+
+import pt_config
+from pt_config import Instr, clamp_pitches
+
+
+class ClampPitchesTests(unittest.TestCase):
+    def setUp(self):
+        setup = {
+            "ORDERED_INSTRS": ["violin"],
+            "INSTRUMENTS": {"violin": Instr(55, 88, 60, 84, False)},
+            "INSTRUMENT_META": {},
+        }
+        patcher = mock.patch.dict(pt_config._cache, setup, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clamps_below_and_above_range(self):
+        self.assertEqual(clamp_pitches("violin", [20, 54, 89, 127]), [55, 55, 88, 88])
+
+    def test_keeps_in_range_pitches(self):
+        self.assertEqual(clamp_pitches("violin", [55, 70, 88]), [55, 70, 88])
+
+    def test_unknown_instrument_passes_through(self):
+        pitches = [0, 200]
+        clamped = clamp_pitches("theremin", pitches)
+        self.assertEqual(clamped, [0, 200])
+        self.assertIsNot(clamped, pitches)
+
+
+if __name__ == "__main__":
+    unittest.main()